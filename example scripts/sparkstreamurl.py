@@ -8,6 +8,10 @@ def get_spark_m3u8():
     """
     Get the Spark M3U8 URL and print it out
     """
+    # Start loading the M3U playlist while we check viewer counts
+    stream_client = StreamURL()
+    stream_client.prefetch()
+    
     # First, check if Spark is online
     viewer_client = ViewerCounts()
     
@@ -27,8 +31,6 @@ def get_spark_m3u8():
     # Get the stream URL from M3U playlist
     print("\nFetching Spark M3U8 URL...")
     
-    stream_client = StreamURL()
-    
     # Try to find spark channel in M3U playlist
     spark_stream = stream_client.get_channel_by_name("spark")
     
@@ -1,5 +1,6 @@
 from .viewercounts import ViewerCounts, Channel
 from .streamurl import StreamURL, StreamChannel
+from ._http import close_session
 
 __version__ = "0.1.0"
-__all__ = ["ViewerCounts", "Channel", "StreamURL", "StreamChannel"]
\ No newline at end of file
+__all__ = ["ViewerCounts", "Channel", "StreamURL", "StreamChannel", "close_session"]
\ No newline at end of file
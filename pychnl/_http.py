@@ -0,0 +1,65 @@
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Connection failures and 5xx/429 responses are retried twice, pausing 0s and
+# then 1s. Read timeouts are not retried and Retry-After is ignored, so no
+# more than three attempts are made
+_RETRY = Retry(
+    total=2,
+    read=0,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD"}),
+    respect_retry_after_header=False,
+    raise_on_status=False,
+)
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Get the HTTP session shared by every pychnl client
+    
+    The session is created lazily on first use and reused afterwards, so
+    connections to webchnl are kept alive across client instances instead
+    of being re-established for every request. Connection errors and
+    5xx/429 responses are retried up to twice, pausing 0s and then 1s;
+    read timeouts are not retried and Retry-After headers are ignored.
+    A client timeout of T seconds limits the connect and each socket read
+    to T seconds; it is not a limit on the whole request, so a response
+    that keeps arriving slowly is never cut off.
+    
+    Returns:
+        requests.Session: The shared session
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(max_retries=_RETRY)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _SESSION = session
+    return _SESSION
+
+
+def close_session():
+    """
+    Close the shared HTTP session and its pooled connections
+    
+    Safe to call at any time; the next request made by any client opens a
+    fresh session.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        session, _SESSION = _SESSION, None
+    if session is not None:
+        session.close()
@@ -0,0 +1,48 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Run a call at most once at a time, sharing its result with concurrent callers"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._future: Optional[Future] = None
+    
+    def run(self, fn: Callable[[], T]) -> T:
+        """
+        Call fn, or wait for the call already in progress and return its result
+        
+        Args:
+            fn (Callable[[], T]): The call to make if none is in progress
+        
+        Returns:
+            T: The result of fn
+        
+        Raises:
+            Exception: Whatever fn raised, re-raised in every waiting caller
+        """
+        with self._lock:
+            future = self._future
+            leader = future is None
+            if leader:
+                future = self._future = Future()
+        
+        if not leader:
+            return future.result()
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._future = None
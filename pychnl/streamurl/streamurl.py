@@ -1,28 +1,90 @@
+import asyncio
+import logging
 import requests
 import re
-from typing import Dict, Optional
+import threading
+import time
+from typing import Dict, List, Optional
+import dataclasses
 from dataclasses import dataclass
 
+from .._http import get_session
+from .._singleflight import SingleFlight
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# An EXTINF metadata line followed by the stream URL line it describes.
+# [^\S\n] is any whitespace except a newline, matching what str.strip() removes
+_EXTINF_RE = re.compile(
+    r'^[^\S\n]*#EXTINF:-1 tvg-id="([^"\n]*)" tvg-name="([^"\n]*)" tvg-logo="([^"\n]*)",[^\n]*\S[^\S\n]*\n'
+    r'[^\S\n]*([^#\s][^\n]*)',
+    re.MULTILINE
+)
+
+
+@dataclass(frozen=True)
 class StreamChannel:
-    """Represents a webchnl stream channel with metadata"""
+    """Represents a webchnl stream channel with metadata (immutable, shared by the cache)"""
+    __slots__ = ("tvg_id", "name", "logo", "stream_url")
+    
     tvg_id: str
     name: str
     logo: str
     stream_url: str
+    
+    def __reduce__(self):
+        # Frozen slotted instances can't be restored attribute by attribute,
+        # so copy and pickle rebuild them through __init__
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+
+
+@dataclass(frozen=True)
+class _Playlist:
+    """One load of the M3U playlist with its lookup indexes, cached as a single unit"""
+    channels: Dict[str, StreamChannel]
+    by_id: Dict[str, StreamChannel]
+    by_folded_name: Dict[str, StreamChannel]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    loaded_at: float
+    
+    def lookup_name(self, channel_name: str) -> Optional[StreamChannel]:
+        """
+        Find a channel by exact name, falling back to a case-insensitive match
+        
+        Args:
+            channel_name (str): The channel name to search for
+            
+        Returns:
+            Optional[StreamChannel]: StreamChannel object if found, None otherwise
+        """
+        channel = self.channels.get(channel_name)
+        if channel is None:
+            channel = self.by_folded_name.get(channel_name.casefold())
+        return channel
 
 
 class StreamURL:
     """Handle stream URL operations for webchnl M3U playlist"""
     
-    def __init__(self, base_url: str = "https://webchnl.live/api"):
+    def __init__(self, base_url: str = "https://webchnl.live/api", cache_ttl: float = 30.0, timeout: float = 10.0):
         self.base_url = base_url
         self.m3u_endpoint = f"{base_url}/master.m3u"
+        self.cache_ttl = cache_ttl
+        # Limits the connect and each socket read of an attempt, not the whole
+        # request; there is no total deadline (see pychnl._http.get_session)
+        self.timeout = timeout
+        # Replaced as a whole on every fetch, so readers never mix two loads
+        self._playlist: Optional[_Playlist] = None
+        self._refresh_flight = SingleFlight()
     
     def get_stream_channels(self) -> Dict[str, StreamChannel]:
         """
-        Fetch all channels with their stream URLs and metadata from M3U playlist
+        Get all channels with their stream URLs and metadata from M3U playlist
+        
+        The playlist is fetched on first use and reused by later calls on this
+        instance for cache_ttl seconds; call refresh() to fetch it again sooner.
+        The returned dictionary is a copy, so changing it does not affect the cache.
         
         Returns:
             Dict[str, StreamChannel]: Dictionary with channel names as keys and StreamChannel objects as values
@@ -31,18 +93,161 @@ class StreamURL:
             requests.RequestException: If API request fails
             ValueError: If M3U parsing fails
         """
+        return dict(self._load_playlist().channels)
+    
+    def _load_playlist(self) -> _Playlist:
+        """
+        Get the cached playlist, fetching it if it is missing or expired
+        
+        The returned object holds the cache's own dictionaries; callers must not
+        modify them.
+        
+        Returns:
+            _Playlist: The cached playlist and its lookup indexes
+        """
+        playlist = self._playlist
+        if playlist is None or time.monotonic() - playlist.loaded_at >= self.cache_ttl:
+            return self._refresh_flight.run(self._fetch_playlist)
+        return playlist
+    
+    async def get_stream_channels_async(self) -> Dict[str, StreamChannel]:
+        """
+        Async version of get_stream_channels, run in the event loop's default executor
+        
+        Returns:
+            Dict[str, StreamChannel]: Dictionary with channel names as keys and StreamChannel objects as values
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_stream_channels)
+    
+    def prefetch(self) -> threading.Thread:
+        """
+        Start loading the M3U playlist in a background thread
+        
+        Lookups made while the prefetch is running wait for it instead of
+        fetching again. Errors are not raised here; the next lookup retries
+        the fetch and raises them.
+        
+        Returns:
+            threading.Thread: The started background thread
+        """
+        thread = threading.Thread(target=self._prefetch_worker, daemon=True)
+        thread.start()
+        return thread
+    
+    def _prefetch_worker(self):
+        """Load the playlist into the cache, ignoring request failures"""
         try:
-            response = requests.get(self.m3u_endpoint)
+            self._load_playlist()
+        except requests.RequestException:
+            pass
+    
+    def refresh(self) -> Dict[str, StreamChannel]:
+        """
+        Fetch the M3U playlist again, replacing any previously loaded channels
+        
+        If another thread is already fetching the playlist for this instance,
+        waits for that fetch and returns its result instead of starting another.
+        
+        Returns:
+            Dict[str, StreamChannel]: Dictionary with channel names as keys and StreamChannel objects as values
+            
+        Raises:
+            requests.RequestException: If API request fails
+            ValueError: If M3U parsing fails
+        """
+        return dict(self._refresh_flight.run(self._fetch_playlist).channels)
+    
+    def _fetch_playlist(self) -> _Playlist:
+        """
+        Download and parse the M3U playlist, storing the result in the cache
+        
+        When a playlist is already cached, the request is made conditional on
+        its ETag / Last-Modified so an unchanged playlist is not downloaded again.
+        
+        Returns:
+            _Playlist: The newly cached playlist and its lookup indexes
+        """
+        cached = self._playlist
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        
+        try:
+            logger.debug("Fetching M3U playlist from %s", self.m3u_endpoint)
+            response = get_session().get(self.m3u_endpoint, headers=headers, timeout=self.timeout)
             response.raise_for_status()
             
-            m3u_content = response.text
-            channels = self._parse_m3u(m3u_content)
+            if response.status_code == 304 and cached is not None:
+                logger.debug("M3U playlist not modified, reusing %d channels", len(cached.channels))
+                playlist = dataclasses.replace(
+                    cached,
+                    etag=response.headers.get("ETag", cached.etag),
+                    last_modified=response.headers.get("Last-Modified", cached.last_modified),
+                    loaded_at=time.monotonic()
+                )
+            else:
+                # M3U8 is UTF-8; without a declared charset requests would either
+                # guess by scanning the body (audio/x-mpegurl) or assume Latin-1 (text/*)
+                if "charset" not in response.headers.get("Content-Type", "").lower():
+                    response.encoding = "utf-8"
+                m3u_content = response.text
+                channels = self._parse_m3u(m3u_content)
+                logger.debug("Parsed %d channels from M3U playlist", len(channels))
+                playlist = _Playlist(
+                    channels=channels,
+                    by_id=self._index_by_id(channels),
+                    by_folded_name=self._index_by_folded_name(channels),
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    loaded_at=time.monotonic()
+                )
+            self._playlist = playlist
             
-            return channels
+            return playlist
             
         except requests.RequestException as e:
             raise requests.RequestException(f"Failed to fetch M3U playlist: {e}")
     
+    def clear_cache(self):
+        """Forget the loaded playlist so the next lookup fetches it again"""
+        self._playlist = None
+    
+    @staticmethod
+    def _index_by_id(channels: Dict[str, StreamChannel]) -> Dict[str, StreamChannel]:
+        """
+        Build a TVG ID lookup table, keeping the first channel for each ID
+        
+        Args:
+            channels (Dict[str, StreamChannel]): Parsed channels
+            
+        Returns:
+            Dict[str, StreamChannel]: Dictionary with TVG IDs as keys and StreamChannel objects as values
+        """
+        by_id = {}
+        for channel in channels.values():
+            by_id.setdefault(channel.tvg_id, channel)
+        return by_id
+    
+    @staticmethod
+    def _index_by_folded_name(channels: Dict[str, StreamChannel]) -> Dict[str, StreamChannel]:
+        """
+        Build a case-insensitive name lookup table, keeping the first channel for each name
+        
+        Args:
+            channels (Dict[str, StreamChannel]): Parsed channels
+            
+        Returns:
+            Dict[str, StreamChannel]: Dictionary with case-folded names as keys and StreamChannel objects as values
+        """
+        by_folded_name = {}
+        for name, channel in channels.items():
+            by_folded_name.setdefault(name.casefold(), channel)
+        return by_folded_name
+    
     def _parse_m3u(self, m3u_content: str) -> Dict[str, StreamChannel]:
         """
         Parse M3U content and extract channel information
@@ -54,43 +259,17 @@ class StreamURL:
             Dict[str, StreamChannel]: Dictionary of parsed channels
         """
         channels = {}
-        lines = m3u_content.strip().split('\n')
         
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # Look for EXTINF lines
-            if line.startswith('#EXTINF:'):
-                # Extract metadata from EXTINF line
-                extinf_match = re.search(
-                    r'#EXTINF:-1 tvg-id="([^"]*)" tvg-name="([^"]*)" tvg-logo="([^"]*)",(.+)',
-                    line
-                )
-                
-                if extinf_match and i + 1 < len(lines):
-                    tvg_id = extinf_match.group(1)
-                    tvg_name = extinf_match.group(2)
-                    tvg_logo = extinf_match.group(3)
-                    display_name = extinf_match.group(4)
-                    
-                    # Next line should be the stream URL
-                    stream_url = lines[i + 1].strip()
-                    
-                    if stream_url and not stream_url.startswith('#'):
-                        channel = StreamChannel(
-                            tvg_id=tvg_id,
-                            name=tvg_name,
-                            logo=tvg_logo,
-                            stream_url=stream_url
-                        )
-                        channels[tvg_name] = channel
-                        
-                    i += 2  # Skip the stream URL line
-                else:
-                    i += 1
-            else:
-                i += 1
+        # Each match is an EXTINF line together with the stream URL on the next line
+        for extinf_match in _EXTINF_RE.finditer(m3u_content):
+            tvg_id, tvg_name, tvg_logo, stream_url = extinf_match.groups()
+            channel = StreamChannel(
+                tvg_id=tvg_id,
+                name=tvg_name,
+                logo=tvg_logo,
+                stream_url=stream_url.rstrip()
+            )
+            channels[tvg_name] = channel
         
         return channels
     
@@ -98,14 +277,41 @@ class StreamURL:
         """
         Get a specific channel by its name
         
+        An exact match is preferred; otherwise the name is matched ignoring case.
+        
+        Args:
+            channel_name (str): The channel name to search for
+            
+        Returns:
+            Optional[StreamChannel]: StreamChannel object if found, None otherwise
+        """
+        return self._load_playlist().lookup_name(channel_name)
+    
+    def get_channels_by_names(self, channel_names: List[str]) -> Dict[str, Optional[StreamChannel]]:
+        """
+        Get several channels by name from a single load of the playlist
+        
+        Args:
+            channel_names (List[str]): The channel names to search for
+            
+        Returns:
+            Dict[str, Optional[StreamChannel]]: Dictionary with the requested names as keys and StreamChannel objects (or None if not found) as values
+        """
+        playlist = self._load_playlist()
+        return {name: playlist.lookup_name(name) for name in channel_names}
+    
+    async def get_channel_by_name_async(self, channel_name: str) -> Optional[StreamChannel]:
+        """
+        Async version of get_channel_by_name, run in the event loop's default executor
+        
         Args:
             channel_name (str): The channel name to search for
             
         Returns:
             Optional[StreamChannel]: StreamChannel object if found, None otherwise
         """
-        channels = self.get_stream_channels()
-        return channels.get(channel_name)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_channel_by_name, channel_name)
     
     def get_channel_by_id(self, tvg_id: str) -> Optional[StreamChannel]:
         """
@@ -117,11 +323,7 @@ class StreamURL:
         Returns:
             Optional[StreamChannel]: StreamChannel object if found, None otherwise
         """
-        channels = self.get_stream_channels()
-        for channel in channels.values():
-            if channel.tvg_id == tvg_id:
-                return channel
-        return None
+        return self._load_playlist().by_id.get(tvg_id)
     
     def get_all_channel_names(self) -> list:
         """
@@ -130,7 +332,7 @@ class StreamURL:
         Returns:
             list: List of channel names
         """
-        channels = self.get_stream_channels()
+        channels = self._load_playlist().channels
         return list(channels.keys())
     
     def get_all_stream_urls(self) -> Dict[str, str]:
@@ -140,7 +342,7 @@ class StreamURL:
         Returns:
             Dict[str, str]: Dictionary with channel names as keys and stream URLs as values
         """
-        channels = self.get_stream_channels()
+        channels = self._load_playlist().channels
         return {name: channel.stream_url for name, channel in channels.items()}
     
     def get_all_logos(self) -> Dict[str, str]:
@@ -150,25 +352,30 @@ class StreamURL:
         Returns:
             Dict[str, str]: Dictionary with channel names as keys and logo URLs as values
         """
-        channels = self.get_stream_channels()
+        channels = self._load_playlist().channels
         return {name: channel.logo for name, channel in channels.items()}
     
     def print_channels_summary(self):
         """Print a formatted summary of all channels"""
-        channels = self.get_stream_channels()
+        channels = self._load_playlist().channels
         
-        print("WebChnl Stream Channels Summary")
-        print("=" * 50)
-        print(f"Total Channels: {len(channels)}")
-        print("\nChannel Details:")
-        print("-" * 50)
+        # Build the whole summary first so it is written with a single print
+        lines = [
+            "WebChnl Stream Channels Summary",
+            "=" * 50,
+            f"Total Channels: {len(channels)}",
+            "\nChannel Details:",
+            "-" * 50,
+        ]
         
         for name, channel in channels.items():
-            print(f"Name: {name}")
-            print(f"  TVG ID: {channel.tvg_id}")
-            print(f"  Logo: {channel.logo}")
-            print(f"  Stream: {channel.stream_url}")
-            print()
+            lines.append(f"Name: {name}")
+            lines.append(f"  TVG ID: {channel.tvg_id}")
+            lines.append(f"  Logo: {channel.logo}")
+            lines.append(f"  Stream: {channel.stream_url}")
+            lines.append("")
+        
+        print("\n".join(lines))
 
 
 # Example usage
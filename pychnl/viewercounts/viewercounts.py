@@ -1,16 +1,31 @@
+import asyncio
+import logging
 import requests
 import json
+import time
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 
+from .._http import get_session
+from .._singleflight import SingleFlight
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
 class Channel:
-    """Represents a webchnl channel with viewer information"""
+    """Represents a webchnl channel with viewer information (immutable, shared by the cache)"""
+    __slots__ = ("name", "slug", "viewers")
+    
     name: str
     slug: str
     viewers: int
     
+    def __reduce__(self):
+        # Frozen slotted instances can't be restored attribute by attribute,
+        # so copy and pickle rebuild them through __init__
+        return (self.__class__, tuple(getattr(self, name) for name in self.__slots__))
+    
     @property
     def is_online(self) -> bool:
         """Returns True if channel is online (viewers >= 0)"""
@@ -25,13 +40,64 @@ class Channel:
 class ViewerCounts:
     """Handle viewer count operations for webchnl API"""
     
-    def __init__(self, base_url: str = "https://webchnl.live/api"):
+    def __init__(self, base_url: str = "https://webchnl.live/api", cache_ttl: float = 10.0, timeout: float = 10.0):
         self.base_url = base_url
         self.viewer_counts_endpoint = f"{base_url}/viewerCounts"
+        self.cache_ttl = cache_ttl
+        # Limits the connect and each socket read of an attempt, not the whole
+        # request; there is no total deadline (see pychnl._http.get_session)
+        self.timeout = timeout
+        self._channels: Optional[List[Channel]] = None
+        self._channels_by_slug: Dict[str, Channel] = {}
+        self._channels_loaded_at = 0.0
+        self._refresh_flight = SingleFlight()
     
     def get_all_channels(self) -> List[Channel]:
         """
-        Fetch all channels with their viewer counts
+        Get all channels with their viewer counts
+        
+        Viewer counts are fetched on first use and reused by later calls on this
+        instance for cache_ttl seconds; call refresh() to fetch them again sooner.
+        The returned list is a copy, so changing it does not affect the cache.
+        
+        Returns:
+            List[Channel]: List of Channel objects with viewer data
+            
+        Raises:
+            requests.RequestException: If API request fails
+            json.JSONDecodeError: If response is not valid JSON
+        """
+        return list(self._load_channels())
+    
+    def _load_channels(self) -> List[Channel]:
+        """
+        Get the cached channels, fetching viewer counts if they are missing or expired
+        
+        Returns the cache's own list; callers must not modify it.
+        
+        Returns:
+            List[Channel]: List of cached channels
+        """
+        if self._channels is None or time.monotonic() - self._channels_loaded_at >= self.cache_ttl:
+            return self._refresh_flight.run(self._fetch_channels)
+        return self._channels
+    
+    async def get_all_channels_async(self) -> List[Channel]:
+        """
+        Async version of get_all_channels, run in the event loop's default executor
+        
+        Returns:
+            List[Channel]: List of Channel objects with viewer data
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_all_channels)
+    
+    def refresh(self) -> List[Channel]:
+        """
+        Fetch viewer counts again, replacing any previously loaded channels
+        
+        If another thread is already fetching viewer counts for this instance,
+        waits for that fetch and returns its result instead of starting another.
         
         Returns:
             List[Channel]: List of Channel objects with viewer data
@@ -40,13 +106,26 @@ class ViewerCounts:
             requests.RequestException: If API request fails
             json.JSONDecodeError: If response is not valid JSON
         """
+        return list(self._refresh_flight.run(self._fetch_channels))
+    
+    def _fetch_channels(self) -> List[Channel]:
+        """
+        Download viewer counts, storing the result in the cache
+        
+        Returns:
+            List[Channel]: List of Channel objects with viewer data
+        """
         try:
-            response = requests.get(self.viewer_counts_endpoint)
+            logger.debug("Fetching viewer counts from %s", self.viewer_counts_endpoint)
+            response = get_session().get(self.viewer_counts_endpoint, timeout=self.timeout)
             response.raise_for_status()
             
             data = response.json()
             channels = [Channel(name=ch["name"], slug=ch["slug"], viewers=ch["viewers"]) 
                        for ch in data]
+            self._channels_by_slug = self._index_by_slug(channels)
+            self._channels = channels
+            self._channels_loaded_at = time.monotonic()
             
             return channels
             
@@ -55,6 +134,26 @@ class ViewerCounts:
         except json.JSONDecodeError as e:
             raise json.JSONDecodeError(f"Invalid JSON response: {e}")
     
+    def clear_cache(self):
+        """Forget the loaded viewer counts so the next lookup fetches them again"""
+        self._channels = None
+    
+    @staticmethod
+    def _index_by_slug(channels: List[Channel]) -> Dict[str, Channel]:
+        """
+        Build a slug lookup table, keeping the first channel for each slug
+        
+        Args:
+            channels (List[Channel]): Fetched channels
+            
+        Returns:
+            Dict[str, Channel]: Dictionary with slugs as keys and Channel objects as values
+        """
+        by_slug = {}
+        for channel in channels:
+            by_slug.setdefault(channel.slug, channel)
+        return by_slug
+    
     def get_channel_by_slug(self, slug: str) -> Optional[Channel]:
         """
         Get a specific channel by its slug
@@ -65,11 +164,21 @@ class ViewerCounts:
         Returns:
             Optional[Channel]: Channel object if found, None otherwise
         """
-        channels = self.get_all_channels()
-        for channel in channels:
-            if channel.slug == slug:
-                return channel
-        return None
+        self._load_channels()
+        return self._channels_by_slug.get(slug)
+    
+    async def get_channel_by_slug_async(self, slug: str) -> Optional[Channel]:
+        """
+        Async version of get_channel_by_slug, run in the event loop's default executor
+        
+        Args:
+            slug (str): The channel slug to search for
+            
+        Returns:
+            Optional[Channel]: Channel object if found, None otherwise
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_channel_by_slug, slug)
     
     def get_online_channels(self) -> List[Channel]:
         """
@@ -78,7 +187,7 @@ class ViewerCounts:
         Returns:
             List[Channel]: List of online channels
         """
-        channels = self.get_all_channels()
+        channels = self._load_channels()
         return [ch for ch in channels if ch.is_online]
     
     def get_offline_channels(self) -> List[Channel]:
@@ -88,7 +197,7 @@ class ViewerCounts:
         Returns:
             List[Channel]: List of offline channels
         """
-        channels = self.get_all_channels()
+        channels = self._load_channels()
         return [ch for ch in channels if ch.is_offline]
     
     def get_total_viewers(self) -> int:
@@ -98,26 +207,32 @@ class ViewerCounts:
         Returns:
             int: Total number of viewers
         """
-        online_channels = self.get_online_channels()
-        return sum(ch.viewers for ch in online_channels)
+        channels = self._load_channels()
+        return sum(ch.viewers for ch in channels if ch.is_online)
     
     def print_viewer_summary(self):
         """Print a formatted summary of all channels and their viewer counts"""
-        channels = self.get_all_channels()
-        online_channels = self.get_online_channels()
+        channels = self._load_channels()
+        online_channels = [ch for ch in channels if ch.is_online]
+        total_viewers = sum(ch.viewers for ch in online_channels)
         
-        print("WebChnl Viewer Count Summary")
-        print("=" * 40)
-        print(f"Total Channels: {len(channels)}")
-        print(f"Online Channels: {len(online_channels)}")
-        print(f"Total Viewers: {self.get_total_viewers()}")
-        print("\nChannel Details:")
-        print("-" * 40)
+        # Build the whole summary first so it is written with a single print
+        lines = [
+            "WebChnl Viewer Count Summary",
+            "=" * 40,
+            f"Total Channels: {len(channels)}",
+            f"Online Channels: {len(online_channels)}",
+            f"Total Viewers: {total_viewers}",
+            "\nChannel Details:",
+            "-" * 40,
+        ]
         
         for channel in channels:
             status = "ONLINE" if channel.is_online else "OFFLINE"
             viewer_text = f"{channel.viewers} viewers" if channel.is_online else "offline"
-            print(f"{channel.name:<20} | {status:<7} | {viewer_text}")
+            lines.append(f"{channel.name:<20} | {status:<7} | {viewer_text}")
+        
+        print("\n".join(lines))
 
 
 # Example usage
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from pychnl._singleflight import SingleFlight
+from pychnl.streamurl import streamurl
+from pychnl.streamurl.streamurl import StreamURL
+
+
+THREADS = 8
+
+PLAYLIST = (
+    '#EXTINF:-1 tvg-id="sp" tvg-name="Spark" tvg-logo="http://logo/sp.png",Spark\n'
+    "https://u/spark.m3u8\n"
+)
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {"Content-Type": "audio/x-mpegurl"}
+    encoding = None
+    text = PLAYLIST
+    
+    def raise_for_status(self):
+        pass
+
+
+class BlockingSession:
+    """Session stub whose get() blocks until released, counting calls"""
+    
+    def __init__(self):
+        self.calls = 0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+    
+    def get(self, url, **kwargs):
+        self.calls += 1
+        self.entered.set()
+        self.release.wait(5)
+        return FakeResponse()
+
+
+def run_in_threads(target):
+    """Start THREADS threads running target and return them"""
+    threads = [threading.Thread(target=target) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_concurrent_refreshes_make_one_fetch(monkeypatch):
+    session = BlockingSession()
+    monkeypatch.setattr(streamurl, "get_session", lambda: session)
+    client = StreamURL()
+    results = []
+    
+    threads = run_in_threads(lambda: results.append(client.refresh()))
+    assert session.entered.wait(5)
+    # Give the other threads time to join the fetch in progress
+    time.sleep(0.2)
+    session.release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert session.calls == 1
+    assert len(results) == THREADS
+    assert all(list(result) == ["Spark"] for result in results)
+    assert client._refresh_flight._future is None
+
+
+def test_leader_exception_reaches_every_waiter():
+    flight = SingleFlight()
+    entered = threading.Event()
+    release = threading.Event()
+    calls = []
+    errors = []
+    
+    def failing_fetch():
+        calls.append(1)
+        entered.set()
+        release.wait(5)
+        raise ValueError("fetch failed")
+    
+    def caller():
+        try:
+            flight.run(failing_fetch)
+        except ValueError as e:
+            errors.append(e)
+    
+    threads = run_in_threads(caller)
+    assert entered.wait(5)
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    
+    assert len(calls) == 1
+    assert len(errors) == THREADS
+    assert all(error is errors[0] for error in errors)
+    assert flight._future is None
+
+
+def test_next_call_runs_again_after_completion():
+    flight = SingleFlight()
+    
+    assert flight.run(lambda: 1) == 1
+    with pytest.raises(KeyError):
+        flight.run(lambda: {}["missing"])
+    assert flight.run(lambda: 2) == 2
+    assert flight._future is None
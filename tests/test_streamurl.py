@@ -0,0 +1,250 @@
+import copy
+import dataclasses
+import pickle
+
+import pytest
+
+from pychnl.streamurl import streamurl
+from pychnl.streamurl.streamurl import StreamURL
+
+
+def extinf(tvg_id, name):
+    return f'#EXTINF:-1 tvg-id="{tvg_id}" tvg-name="{name}" tvg-logo="http://logo/{tvg_id}.png",{name}'
+
+
+PLAYLIST = extinf("sp", "Spark") + "\nhttps://u/spark.m3u8\n"
+
+
+def parse(*lines, sep="\n"):
+    return StreamURL()._parse_m3u(sep.join(lines))
+
+
+class FakeResponse:
+    def __init__(self, text="", status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = {"Content-Type": "audio/x-mpegurl", **(headers or {})}
+        self.encoding = None
+        self.text = text
+    
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """Session stub returning queued responses and recording request headers"""
+    
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+    
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(streamurl, "get_session", lambda: session)
+    return session
+
+
+def test_parse_m3u_basic():
+    channels = parse("#EXTM3U", extinf("sp", "Spark"), "https://delta.webchnl.live/memfs/spark.m3u8")
+    
+    assert list(channels) == ["Spark"]
+    channel = channels["Spark"]
+    assert channel.tvg_id == "sp"
+    assert channel.logo == "http://logo/sp.png"
+    assert channel.stream_url == "https://delta.webchnl.live/memfs/spark.m3u8"
+
+
+def test_parse_m3u_crlf():
+    channels = parse(
+        "#EXTM3U",
+        extinf("sp", "Spark"), "https://u/spark.m3u8",
+        extinf("en", "2x2_English"), "https://u/en.m3u8",
+        "",
+        sep="\r\n",
+    )
+    
+    assert {name: ch.stream_url for name, ch in channels.items()} == {
+        "Spark": "https://u/spark.m3u8",
+        "2x2_English": "https://u/en.m3u8",
+    }
+
+
+def test_parse_m3u_indented_lines():
+    channels = parse("  " + extinf("sp", "Spark") + " \t", "\t  https://u/spark.m3u8  ")
+    
+    assert channels["Spark"].stream_url == "https://u/spark.m3u8"
+
+
+def test_parse_m3u_unicode_whitespace_is_stripped():
+    # Anything str.strip() removes is ignored around the lines
+    channels = parse(extinf("sp", "Spark") + "\xa0", "\vhttps://u/spark.m3u8\x85")
+    
+    assert channels["Spark"].stream_url == "https://u/spark.m3u8"
+
+
+def test_parse_m3u_blank_line_after_extinf_is_skipped():
+    channels = parse(extinf("sp", "Spark"), "", "https://u/spark.m3u8")
+    
+    assert channels == {}
+
+
+def test_parse_m3u_comment_line_after_extinf_is_skipped():
+    channels = parse(extinf("sp", "Spark"), "#EXTVLCOPT:http-user-agent=x", "https://u/spark.m3u8")
+    
+    assert channels == {}
+
+
+def test_parse_m3u_back_to_back_extinf_keeps_second_entry():
+    # An EXTINF without a URL line no longer swallows the entry after it
+    channels = parse(extinf("sp", "Spark"), extinf("en", "2x2_English"), "https://u/en.m3u8")
+    
+    assert list(channels) == ["2x2_English"]
+    assert channels["2x2_English"].stream_url == "https://u/en.m3u8"
+
+
+def test_parse_m3u_later_duplicate_name_wins():
+    channels = parse(extinf("a", "Spark"), "https://u/a.m3u8", extinf("b", "Spark"), "https://u/b.m3u8")
+    
+    assert channels["Spark"].tvg_id == "b"
+
+
+def test_stream_channel_is_immutable():
+    channel = parse(extinf("sp", "Spark"), "https://u/spark.m3u8")["Spark"]
+    
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        channel.stream_url = "MUTATED"
+    assert channel.stream_url == "https://u/spark.m3u8"
+
+
+def test_stream_channel_copies_and_pickles():
+    channel = parse(extinf("sp", "Spark"), "https://u/spark.m3u8")["Spark"]
+    
+    assert copy.copy(channel) == channel
+    assert pickle.loads(pickle.dumps(channel)) == channel
+
+
+def test_lookups_use_one_playlist_snapshot(session):
+    session.responses += [
+        FakeResponse(extinf("a", "Spark") + "\nhttps://u/a.m3u8"),
+        FakeResponse(extinf("b", "SPARK") + "\nhttps://u/b.m3u8"),
+    ]
+    client = StreamURL()
+    playlist = client._load_playlist()
+    client.refresh()
+    
+    # A snapshot taken before the refresh keeps its own channels and indexes
+    assert playlist.lookup_name("spark").tvg_id == "a"
+    assert client.get_channel_by_name("spark").tvg_id == "b"
+    assert client.get_channel_by_id("a") is None
+
+
+def test_not_modified_reuses_cached_playlist(session):
+    session.responses += [
+        FakeResponse(PLAYLIST, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        FakeResponse(status_code=304, headers={"ETag": '"v2"'}),
+    ]
+    client = StreamURL()
+    first = client._load_playlist()
+    second = client._fetch_playlist()
+    
+    assert session.requests[1] == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+    assert second.channels is first.channels
+    assert second.by_id is first.by_id
+    assert second.by_folded_name is first.by_folded_name
+    assert second.etag == '"v2"'
+    assert second.last_modified == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert client.get_channel_by_id("sp").name == "Spark"
+
+
+def test_not_modified_without_etag_keeps_old_etag(session):
+    session.responses += [
+        FakeResponse(PLAYLIST, headers={"ETag": '"v1"'}),
+        FakeResponse(status_code=304),
+        FakeResponse(status_code=304),
+    ]
+    client = StreamURL()
+    client._load_playlist()
+    client.refresh()
+    client.refresh()
+    
+    assert client._playlist.etag == '"v1"'
+    assert session.requests[2] == {"If-None-Match": '"v1"'}
+
+
+def test_clear_cache_drops_validators(session):
+    session.responses += [
+        FakeResponse(PLAYLIST, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        FakeResponse(PLAYLIST),
+    ]
+    client = StreamURL()
+    client._load_playlist()
+    client.clear_cache()
+    client.get_stream_channels()
+    
+    assert session.requests[1] == {}
+
+
+def test_cache_expires_after_ttl(session, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(streamurl.time, "monotonic", lambda: now[0])
+    session.responses += [FakeResponse(PLAYLIST), FakeResponse(PLAYLIST)]
+    client = StreamURL(cache_ttl=30.0)
+    
+    client.get_stream_channels()
+    now[0] += 29.9
+    client.get_stream_channels()
+    assert len(session.requests) == 1
+    
+    now[0] += 0.1
+    client.get_stream_channels()
+    assert len(session.requests) == 2
+
+
+def test_zero_ttl_fetches_every_time(session):
+    session.responses += [FakeResponse(PLAYLIST), FakeResponse(PLAYLIST)]
+    client = StreamURL(cache_ttl=0)
+    
+    client.get_stream_channels()
+    client.get_stream_channels()
+    
+    assert len(session.requests) == 2
+
+
+@pytest.mark.parametrize("content_type, encoding", [
+    ("audio/x-mpegurl", "utf-8"),
+    ("text/plain", "utf-8"),
+    ("text/plain; charset=ISO-8859-1", None),
+    ("audio/x-mpegurl; Charset=windows-1251", None),
+])
+def test_decodes_as_utf8_unless_charset_declared(session, content_type, encoding):
+    response = FakeResponse(PLAYLIST, headers={"Content-Type": content_type})
+    session.responses.append(response)
+    
+    StreamURL().get_stream_channels()
+    
+    assert response.encoding == encoding
+
+
+def test_name_lookup_prefers_exact_match(session):
+    session.responses.append(FakeResponse(
+        extinf("lower", "spark") + "\nhttps://u/lower.m3u8\n"
+        + extinf("upper", "Spark") + "\nhttps://u/upper.m3u8\n"
+        + extinf("ss", "Straße") + "\nhttps://u/ss.m3u8\n"
+    ))
+    client = StreamURL()
+    
+    assert client.get_channel_by_name("Spark").tvg_id == "upper"
+    assert client.get_channel_by_name("spark").tvg_id == "lower"
+    # Case-insensitive matches fall back to the first channel in the playlist
+    assert client.get_channel_by_name("SPARK").tvg_id == "lower"
+    assert client.get_channel_by_name("STRASSE").tvg_id == "ss"
+    assert client.get_channel_by_name("Sparky") is None
+    assert len(session.requests) == 1
@@ -0,0 +1,63 @@
+import copy
+import dataclasses
+import pickle
+
+import pytest
+
+from pychnl.viewercounts import viewercounts
+from pychnl.viewercounts.viewercounts import Channel, ViewerCounts
+
+
+VIEWER_COUNTS = [
+    {"name": "Spark", "slug": "spark", "viewers": 5},
+    {"name": "Offline", "slug": "offline", "viewers": -1},
+]
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {"Content-Type": "application/json"}
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return VIEWER_COUNTS
+
+
+class FakeSession:
+    """Session stub returning VIEWER_COUNTS, counting calls"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def get(self, url, **kwargs):
+        self.calls += 1
+        return FakeResponse()
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(viewercounts, "get_session", lambda: session)
+    return session
+
+
+def test_cached_channels_cannot_be_mutated(session):
+    client = ViewerCounts()
+    channels = client.get_all_channels()
+    
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        channels[0].viewers = 500
+    channels.append(channels[0])
+    
+    assert client.get_total_viewers() == 5
+    assert len(client.get_all_channels()) == 2
+    assert session.calls == 1
+
+
+def test_channel_copies_and_pickles():
+    channel = Channel(name="Spark", slug="spark", viewers=5)
+    
+    assert copy.copy(channel) == channel
+    assert pickle.loads(pickle.dumps(channel)) == channel